@@ -1,22 +1,39 @@
 from __future__ import annotations
 
+import ctypes
+import hashlib
 import json
 import logging
+import os
+import sys
 import wave
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, Optional
+from typing import Dict, Iterable, Optional, Tuple
 
 import numpy as np
 
+try:
+    import soundfile as sf
+except (ImportError, OSError):  # pragma: no cover - optional, falls back to the wave module
+    sf = None
+
 from .config import Mode
 
 LOGGER = logging.getLogger(__name__)
 
+_ATLAS_ALIGNMENT = 64  # bytes; start each packed clip on its own cache line
+_READ_CHUNK_FRAMES = 16384  # frames per wave.readframes call in the stdlib decoder
+
 
 @dataclass(frozen=True)
 class AudioClip:
-    samples: np.ndarray  # shape: (frames, channels), dtype float32 in [-1, 1]
+    # Interleaved (frames, channels) float32, the same layout as the sounddevice
+    # output buffer, so mixing a clip is a straight row-wise add. Values may exceed
+    # [-1, 1] once the playback volume has been applied; the mixer clips the sum.
+    samples: np.ndarray
     sample_rate: int
 
     @property
@@ -31,23 +48,33 @@ class AudioClip:
         if channels == self.channels:
             return self
         if self.channels == 1 and channels == 2:
-            expanded = np.repeat(self.samples, 2, axis=1)
+            # Read-only view; AudioLibrary materialises it once when formatting the clip.
+            expanded = np.broadcast_to(self.samples, (self.frame_count, 2))
             return AudioClip(expanded, self.sample_rate)
         if self.channels == 2 and channels == 1:
-            collapsed = self.samples.mean(axis=1, keepdims=True)
+            collapsed = np.empty((self.frame_count, 1), dtype=np.float32)
+            np.add(self.samples[:, 0], self.samples[:, 1], out=collapsed[:, 0])
+            collapsed *= np.float32(0.5)
             return AudioClip(collapsed, self.sample_rate)
         raise ValueError(f"Cannot convert {self.channels} channels clip to {channels}")
 
 
 class AudioLibrary:
-    def __init__(self, mode: Mode, source: Path) -> None:
+    def __init__(self, mode: Mode, source: Path, volume: float = 1.0) -> None:
         self.mode = mode
         self.source = source
+        self.volume = volume
         self.sample_rate: Optional[int] = None
         self.channels: Optional[int] = None
         self._clips: Dict[str, AudioClip] = {}
+        # Final playback buffers: C-contiguous float32, output channel count, volume applied.
+        self._clips_raw: Dict[str, np.ndarray] = {}
         self.default_clip: Optional[AudioClip] = None
-        self._path_cache: Dict[Path, AudioClip] = {}
+        self._content_cache: Dict[bytes, AudioClip] = {}
+        # Decodes by path, kept only while _load runs so a failed load cannot serve
+        # stale samples to the next library built from the same files.
+        self._decode_cache: Dict[str, Tuple[np.ndarray, int]] = {}
+        self._atlas: Optional[np.ndarray] = None
         self._load()
 
     @property
@@ -58,11 +85,16 @@ class AudioLibrary:
         return self._clips.get(name)
 
     def _load(self) -> None:
+        try:
+            self._load_clips()
+        finally:
+            self._decode_cache.clear()
+            self._content_cache.clear()
+
+    def _load_clips(self) -> None:
         if self.mode is Mode.SINGLE_FILE:
             clip = self._load_clip(self.source)
-            clip = self._ensure_format(clip)
-            self._clips["default"] = clip
-            self.default_clip = clip
+            self._register("default", self._ensure_format(clip))
         elif self.mode is Mode.DIRECTORY:
             self._load_directory(self.source)
         elif self.mode is Mode.JSON:
@@ -76,25 +108,34 @@ class AudioLibrary:
             self.default_clip = self._clips.get("default")
         if self.default_clip is None:
             self.default_clip = next(iter(self._clips.values()))
+        self._pack_atlas()
 
     def _load_directory(self, directory: Path) -> None:
         if not directory.exists():
             raise FileNotFoundError(f"Audio directory does not exist: {directory}")
-        for file in sorted(directory.iterdir()):
-            if not file.is_file():
-                continue
-            if file.suffix.lower() != ".wav":
-                continue
-            key = file.stem.lower()
+        # scandir entries carry the file type from the directory listing, so rejected
+        # names cost neither a stat call nor a Path object.
+        with os.scandir(directory) as scan:
+            entries = sorted(
+                (
+                    entry
+                    for entry in scan
+                    if len(entry.name) > 4 and entry.name[-4:].lower() == ".wav" and entry.is_file()
+                ),
+                key=lambda entry: entry.name,
+            )
+        # Decode in parallel (file reads and NumPy conversion release the GIL), then
+        # validate and register serially so the output format is settled in order.
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = [executor.submit(self._load_clip, Path(entry.path)) for entry in entries]
+        for entry, future in zip(entries, futures):
+            key = entry.name[:-4].lower()
             try:
-                clip = self._load_clip(file)
+                clip = future.result()
             except Exception as exc:  # noqa: BLE001
-                LOGGER.warning("Failed to load %s: %s", file, exc)
+                LOGGER.warning("Failed to load %s: %s", entry.path, exc)
                 continue
-            formatted = self._ensure_format(clip)
-            self._clips[key] = formatted
-            if key == "default":
-                self.default_clip = formatted
+            self._register(key, self._share(self._ensure_format(clip)))
 
     def _load_json(self, json_path: Path) -> None:
         with json_path.open("r", encoding="utf-8") as handle:
@@ -114,33 +155,65 @@ class AudioLibrary:
             wav_name = str(value)
             wav_path = (audio_dir / wav_name).resolve()
             if wav_name in cache:
-                clip = cache[wav_name]
+                formatted = cache[wav_name]
             else:
                 try:
                     clip = self._load_clip(wav_path)
                 except Exception as exc:  # noqa: BLE001
                     LOGGER.warning("Failed to load %s for key %s: %s", wav_path, key, exc)
                     continue
-                cache[wav_name] = clip
-            formatted = self._ensure_format(clip)
-            key_lower = key.lower()
-            self._clips[key_lower] = formatted
-            if key_lower == "default":
-                self.default_clip = formatted
+                formatted = self._share(self._ensure_format(clip))
+                cache[wav_name] = formatted
+            self._register(key.lower(), formatted)
+
+    def _register(self, key: str, clip: AudioClip) -> None:
+        key = sys.intern(key)
+        self._clips[key] = clip
+        self._clips_raw[key] = clip.samples
+        if key == "default":
+            self.default_clip = clip
+
+    def _pack_atlas(self) -> None:
+        # Lay every distinct clip end to end in one allocation, each starting on a
+        # cache line, so playback walks one contiguous region instead of scattered
+        # heap blocks. Shared clips stay shared.
+        align = _ATLAS_ALIGNMENT // np.dtype(np.float32).itemsize
+        unique: Dict[int, AudioClip] = {}
+        for clip in self._clips.values():
+            unique.setdefault(id(clip), clip)
+        total = sum(-(-clip.samples.size // align) * align for clip in unique.values())
+        buffer = np.empty(total + align, dtype=np.float32)
+        start = (-buffer.ctypes.data % _ATLAS_ALIGNMENT) // buffer.itemsize
+        atlas = buffer[start : start + total]
+        packed: Dict[int, AudioClip] = {}
+        offset = 0
+        for clip_id, clip in unique.items():
+            size = clip.samples.size
+            view = atlas[offset : offset + size].reshape(clip.samples.shape)
+            view[...] = clip.samples
+            packed[clip_id] = AudioClip(view, clip.sample_rate)
+            offset += -(-size // align) * align
+
+        self._atlas = atlas
+        self._clips = {key: packed[id(clip)] for key, clip in self._clips.items()}
+        self._clips_raw = {key: clip.samples for key, clip in self._clips.items()}
+        if self.default_clip is not None:
+            self.default_clip = packed[id(self.default_clip)]
+        _lock_pages(buffer)
+
+    def _share(self, clip: AudioClip) -> AudioClip:
+        # Identical audio stored under different file names resolves to one buffer.
+        digest = hashlib.blake2b(clip.samples, digest_size=16)
+        digest.update(repr((clip.samples.shape, clip.sample_rate)).encode())
+        return self._content_cache.setdefault(digest.digest(), clip)
 
     def _load_clip(self, path: Path) -> AudioClip:
-        if path in self._path_cache:
-            return self._path_cache[path]
-        with wave.open(str(path), "rb") as wav:
-            sample_rate = wav.getframerate()
-            channels = wav.getnchannels()
-            sample_width = wav.getsampwidth()
-            frame_count = wav.getnframes()
-            raw = wav.readframes(frame_count)
-        samples = _decode_samples(raw, sample_width, channels)
-        clip = AudioClip(samples, sample_rate)
-        self._path_cache[path] = clip
-        return clip
+        path_str = str(path)
+        decoded = self._decode_cache.get(path_str)
+        if decoded is None:
+            decoded = self._decode_cache[path_str] = _decode_wav(path_str)
+        samples, sample_rate = decoded
+        return AudioClip(samples, sample_rate)
 
     def _ensure_format(self, clip: AudioClip) -> AudioClip:
         if self.sample_rate is None:
@@ -159,37 +232,161 @@ class AudioLibrary:
                 raise ValueError(
                     f"Channel mismatch: expected {self.channels}, got {clip.channels}"
                 ) from exc
+
+        # Apply the volume once here so the audio callback only has to copy samples.
+        samples = clip.samples
+        if self.volume != 1.0:
+            samples = samples * np.float32(self.volume)
+        samples = np.ascontiguousarray(samples, dtype=np.float32)
+        if samples is not clip.samples:
+            clip = AudioClip(samples, clip.sample_rate)
         return clip
 
 
-def _decode_samples(raw: bytes, sample_width: int, channels: int) -> np.ndarray:
+def _decode_wav(path_str: str) -> Tuple[np.ndarray, int]:
+    path = Path(path_str)
+    entry = _cache_entry(path)
+    clip = _read_cached_clip(entry) if entry is not None else None
+    if clip is not None:
+        return clip.samples, clip.sample_rate
+    if sf is not None:
+        samples, sample_rate = _read_soundfile(path_str)
+    else:
+        samples, sample_rate = _read_wave(path_str)
+    # Cached results are shared between callers; keep them immutable.
+    samples.flags.writeable = False
+    if entry is not None:
+        _write_cached_clip(entry, AudioClip(samples, sample_rate))
+    return samples, sample_rate
+
+
+def _read_soundfile(path_str: str) -> Tuple[np.ndarray, int]:
+    # libsndfile decodes, converts and scales to float32 in a single C pass.
+    data, sample_rate = sf.read(path_str, dtype="float32", always_2d=True)
+    if data.shape[1] not in (1, 2):
+        raise ValueError(f"Unsupported channel count: {data.shape[1]}")
+    return np.ascontiguousarray(data), int(sample_rate)
+
+
+def _read_wave(path_str: str) -> Tuple[np.ndarray, int]:
+    with wave.open(path_str, "rb") as wav:
+        sample_rate = wav.getframerate()
+        channels = wav.getnchannels()
+        sample_width = wav.getsampwidth()
+        frame_count = wav.getnframes()
+        # Decode chunk by chunk straight into the final buffer so the raw PCM for
+        # the whole file is never held in memory alongside the decoded samples.
+        samples = np.empty((frame_count, channels), dtype=np.float32)
+        flat = samples.reshape(-1)
+        frame_bytes = sample_width * channels
+        offset = 0
+        while offset < frame_count:
+            raw = wav.readframes(min(_READ_CHUNK_FRAMES, frame_count - offset))
+            frames = len(raw) // frame_bytes if frame_bytes else 0
+            if frames == 0:
+                break
+            out = flat[offset * channels : (offset + frames) * channels]
+            _decode_samples(raw[: frames * frame_bytes], sample_width, channels, out=out)
+            offset += frames
+    return samples[:offset], sample_rate
+
+
+def _lock_pages(buffer: np.ndarray) -> None:
+    # Copying into the atlas has already faulted every page in; locking keeps them
+    # resident so a clip played after an idle spell cannot page-fault inside the
+    # audio callback. Best effort: RLIMIT_MEMLOCK is often only a few MiB.
+    if sys.platform not in ("linux", "darwin") or buffer.nbytes == 0:
+        return
+    address = ctypes.c_void_p(buffer.ctypes.data)
+    size = ctypes.c_size_t(buffer.nbytes)
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        result = libc.mlock(address, size)
+    except (OSError, AttributeError) as exc:
+        LOGGER.debug("mlock unavailable: %s", exc)
+        return
+    if result != 0:
+        LOGGER.debug("Unable to lock %d bytes of clip data: %s", buffer.nbytes, os.strerror(ctypes.get_errno()))
+        return
+    # Heap blocks are not unlocked by free(), and every runner start builds a new
+    # library, so release the lock explicitly when the buffer is collected.
+    weakref.finalize(buffer, libc.munlock, address, size)
+
+
+def _cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME")
+    return (Path(base) if base else Path.home() / ".cache") / "keysound"
+
+
+def _cache_entry(path: Path) -> Optional[Path]:
+    """Return the cache path (without suffix) for the decoded samples of ``path``."""
+    try:
+        stat = path.stat()
+        with path.open("rb") as handle:
+            head = handle.read(4096)
+    except OSError:
+        return None
+    digest = hashlib.blake2b(head, digest_size=8)
+    digest.update(f"{path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return _cache_dir() / digest.hexdigest()
+
+
+def _read_cached_clip(entry: Path) -> Optional[AudioClip]:
+    # The sample rate sidecar is written last, so its presence means the .npy is complete.
+    try:
+        sample_rate = int(entry.with_suffix(".rate").read_text(encoding="ascii"))
+        samples = np.load(entry.with_suffix(".npy"), mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    if samples.dtype != np.float32 or samples.ndim != 2:
+        return None
+    return AudioClip(samples, sample_rate)
+
+
+def _write_cached_clip(entry: Path, clip: AudioClip) -> None:
+    try:
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp = entry.with_suffix(f".{os.getpid()}.tmp")
+        with tmp.open("wb") as handle:
+            np.save(handle, clip.samples)
+        os.replace(tmp, entry.with_suffix(".npy"))
+        # Replace the sidecar atomically too: a reader must never see a truncated rate.
+        rate_tmp = entry.with_suffix(f".{os.getpid()}.rate.tmp")
+        rate_tmp.write_text(str(clip.sample_rate), encoding="ascii")
+        os.replace(rate_tmp, entry.with_suffix(".rate"))
+    except OSError as exc:
+        LOGGER.debug("Unable to cache decoded samples in %s: %s", entry.parent, exc)
+
+
+def _decode_samples(
+    raw: bytes, sample_width: int, channels: int, out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    if channels not in (1, 2):
+        raise ValueError(f"Unsupported channel count: {channels}")
     if sample_width == 1:
-        data = np.frombuffer(raw, dtype=np.uint8).astype(np.float32)
-        data = (data - 128.0) / 128.0
+        src = np.frombuffer(raw, dtype=np.uint8)
+        data = np.subtract(src, np.float32(128.0), dtype=np.float32, out=out)
+        data *= np.float32(1.0 / 128.0)
     elif sample_width == 2:
-        data = np.frombuffer(raw, dtype=np.int16).astype(np.float32)
-        data /= 32768.0
+        src = np.frombuffer(raw, dtype=np.int16)
+        data = np.multiply(src, np.float32(1.0 / 32768.0), dtype=np.float32, out=out)
     elif sample_width == 3:
         data = np.frombuffer(raw, dtype=np.uint8)
         frames = data.size // 3
-        data = data.reshape(frames, 3).astype(np.int32)
-        signed = data[:, 0] | (data[:, 1] << 8) | (data[:, 2] << 16)
-        mask = signed & 0x800000
-        signed = (signed & 0x7FFFFF) - mask
-        data = signed.astype(np.float32) / 8388608.0
+        # Place each 3-byte sample in the top of a little-endian int32 and let the
+        # arithmetic shift sign-extend it, instead of assembling it byte by byte.
+        padded = np.zeros((frames, 4), dtype=np.uint8)
+        padded[:, 1:] = data[: frames * 3].reshape(frames, 3)
+        signed = padded.view("<i4").reshape(-1) >> 8
+        data = np.multiply(signed, np.float32(1.0 / 8388608.0), dtype=np.float32, out=out)
     elif sample_width == 4:
-        data = np.frombuffer(raw, dtype=np.int32).astype(np.float32)
-        data /= 2147483648.0
+        src = np.frombuffer(raw, dtype=np.int32)
+        data = np.multiply(src, np.float32(1.0 / 2147483648.0), dtype=np.float32, out=out)
     else:
         raise ValueError(f"Unsupported sample width: {sample_width}")
 
-    if channels not in (1, 2):
-        raise ValueError(f"Unsupported channel count: {channels}")
-    if data.ndim == 1:
-        data = data.reshape(-1, channels)
-    else:
-        data = data.reshape(-1, channels)
-    return np.asarray(data, dtype=np.float32)
+    # Every branch already produced a flat float32 array; this is only a view.
+    return data.reshape(-1, channels)
 
 
 __all__ = ["AudioClip", "AudioLibrary"]
@@ -35,10 +35,12 @@ class _PynputListener:
     def start(self) -> None:
         if self._listener is not None:
             return
+        debug = LOGGER.isEnabledFor(logging.DEBUG)
 
         def _on_press(key):
             for candidate in iter_candidate_names(key):
-                LOGGER.debug("pynput dispatch %s", candidate)
+                if debug:
+                    LOGGER.debug("pynput dispatch %s", candidate)
                 if self._handler(candidate):
                     return
 
@@ -63,15 +65,18 @@ class _MacListenerWrapper:
             raise RuntimeError("macOS listener unavailable")
         self._listener = MacKeyListener(self._handle)
         self._handler = handler
+        self._debug = False
 
     def _handle(self, name: str) -> bool:
-        LOGGER.debug("mac listener dispatch %s", name)
+        if self._debug:
+            LOGGER.debug("mac listener dispatch %s", name)
         for candidate in key_candidates(name):
             if self._handler(candidate):
                 return True
         return False
 
     def start(self) -> None:
+        self._debug = LOGGER.isEnabledFor(logging.DEBUG)
         self._listener.start()
 
     def stop(self) -> None:
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
-from typing import Iterable, List
+import string
+import sys
+from functools import lru_cache
+from typing import List, Tuple
 
 from pynput import keyboard
 
+from .mac_keys import MAC_KEYCODE_MAP
+
 
 def _build_special_names() -> dict[keyboard.Key, str]:
     result: dict[keyboard.Key, str] = {}
@@ -11,7 +16,7 @@ def _build_special_names() -> dict[keyboard.Key, str]:
     def add(attr: str, label: str) -> None:
         key = getattr(keyboard.Key, attr, None)
         if key is not None:
-            result[key] = label
+            result[key] = sys.intern(label)
 
     add("space", "space")
     add("enter", "enter")
@@ -69,15 +74,21 @@ _KEY_ALIASES = {
 }
 
 
+def _keycode_name(char: str | None, vk: int | None) -> str | None:
+    if char:
+        if char.islower() or not char.isalpha():
+            return char
+        return char.lower()
+    if vk is not None:
+        return f"vk_{vk}"
+    return None
+
+
 def key_to_name(key: keyboard.Key | keyboard.KeyCode | None) -> str | None:
     if key is None:
         return None
     if isinstance(key, keyboard.KeyCode):
-        if key.char:
-            return key.char.lower()
-        if key.vk is not None:
-            return f"vk_{key.vk}"
-        return None
+        return _keycode_name(key.char, key.vk)
     name = _SPECIAL_NAMES.get(key)
     if name:
         return name
@@ -86,8 +97,7 @@ def key_to_name(key: keyboard.Key | keyboard.KeyCode | None) -> str | None:
     return None
 
 
-def key_candidates(name: str) -> List[str]:
-    base = name.lower()
+def _expand_candidates(base: str) -> Tuple[str, ...]:
     candidates: List[str] = [base]
     aliases = _KEY_ALIASES.get(base, [])
     candidates.extend(aliases)
@@ -106,16 +116,63 @@ def key_candidates(name: str) -> List[str]:
         if item not in seen:
             seen.add(item)
             ordered.append(item)
-    return ordered
+    return tuple(sys.intern(item) for item in ordered)
+
+
+# Candidate lists for every name a listener can report, expanded once at import
+# so a keystroke only costs a dict lookup.
+_CANDIDATE_CACHE: dict[str, Tuple[str, ...]] = {
+    name: _expand_candidates(name)
+    for name in (
+        *_SPECIAL_NAMES.values(),
+        *_KEY_ALIASES,
+        *MAC_KEYCODE_MAP.values(),
+        *string.ascii_lowercase,
+        *string.digits,
+        *string.punctuation,
+    )
+}
+
 
+def key_candidates(name: str) -> Tuple[str, ...]:
+    candidates = _CANDIDATE_CACHE.get(name)
+    if candidates is None:
+        candidates = _expand_candidates(name.lower())
+    return candidates
 
-def iter_candidate_names(key: keyboard.Key | keyboard.KeyCode | None) -> Iterable[str]:
+
+def _build_candidates_by_key_id() -> dict[int, Tuple[str, ...]]:
+    result: dict[int, Tuple[str, ...]] = {}
+    for key in keyboard.Key:
+        name = key_to_name(key)
+        result[id(key)] = key_candidates(name) if name else ("default",)
+    return result
+
+
+# Key members are singletons, so their candidates are resolved once and found by
+# identity; hashing the enum member itself would run Enum.__hash__ in Python.
+_CANDIDATES_BY_KEY_ID = _build_candidates_by_key_id()
+
+
+@lru_cache(maxsize=512)
+def _keycode_candidates(char: str | None, vk: int | None) -> Tuple[str, ...]:
+    # KeyCode instances are created per event, so they are cached by their contents.
+    name = _keycode_name(char, vk)
+    if not name:
+        return ("default",)
+    return key_candidates(name)
+
+
+def iter_candidate_names(key: keyboard.Key | keyboard.KeyCode | None) -> Tuple[str, ...]:
+    candidates = _CANDIDATES_BY_KEY_ID.get(id(key))
+    if candidates is not None:
+        return candidates
+    if isinstance(key, keyboard.KeyCode):
+        return _keycode_candidates(key.char, key.vk)
     name = key_to_name(key)
     if not name:
-        yield "default"
-        return
-    for candidate in key_candidates(name):
-        yield candidate
+        return ("default",)
+    return key_candidates(name)
 
 
 __all__ = ["key_to_name", "key_candidates", "iter_candidate_names"]
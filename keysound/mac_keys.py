@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import sys
+
 MAC_KEYCODE_MAP: dict[int, str] = {
     0: "a",
     1: "s",
@@ -117,8 +119,19 @@ MAC_KEYCODE_MAP: dict[int, str] = {
 }
 
 
+_KEYCODE_TABLE_SIZE = 256
+
+# Dense lookup table built once so the event-tap callback indexes a tuple instead
+# of hashing into a dict; virtual keycodes are all below 128.
+_KEYCODE_TABLE: tuple[str, ...] = tuple(
+    sys.intern(MAC_KEYCODE_MAP.get(keycode, "default")) for keycode in range(_KEYCODE_TABLE_SIZE)
+)
+
+
 def keycode_to_name(keycode: int) -> str:
-    return MAC_KEYCODE_MAP.get(keycode, "default")
+    if 0 <= keycode < _KEYCODE_TABLE_SIZE:
+        return _KEYCODE_TABLE[keycode]
+    return "default"
 
 
 __all__ = ["keycode_to_name"]
@@ -3,6 +3,8 @@ from __future__ import annotations
 import logging
 import sys
 import threading
+import time
+from functools import lru_cache
 from typing import Callable
 
 from .mac_keys import keycode_to_name
@@ -12,8 +14,13 @@ LOGGER = logging.getLogger(__name__)
 Handler = Callable[[str], bool]
 
 
-def _check_accessibility_permission() -> bool:
-    """Return True when macOS Accessibility permission is granted."""
+_TRUST_CACHE_SECONDS = 2.0
+_trust_cache: tuple[float, bool] | None = None
+
+
+@lru_cache(maxsize=1)
+def _load_trust_check() -> Callable[[], bool] | None:
+    """Resolve the accessibility check once per process; None if it cannot be done."""
     try:
         from Quartz import (  # type: ignore
             AXIsProcessTrusted,
@@ -22,27 +29,51 @@ def _check_accessibility_permission() -> bool:
         )
     except Exception as exc:  # pragma: no cover - PyObjC not available
         LOGGER.debug("Quartz accessibility check unavailable via PyObjC: %s", exc)
-        try:
-            import ctypes
-            from ctypes import util
-
-            path = util.find_library("ApplicationServices")
-            if not path:
-                LOGGER.warning("Unable to locate ApplicationServices framework to verify accessibility permission")
-                return True
-            quartz = ctypes.cdll.LoadLibrary(path)
-            quartz.AXIsProcessTrusted.restype = ctypes.c_bool
-            quartz.AXIsProcessTrusted.argtypes = []
-            return bool(quartz.AXIsProcessTrusted())
-        except Exception as cexc:  # pragma: no cover
-            LOGGER.warning("Unable to verify accessibility permission: %s", cexc)
-            return True
+    else:
+        def _pyobjc_check() -> bool:
+            try:
+                trusted = AXIsProcessTrustedWithOptions({kAXTrustedCheckOptionPrompt: True})
+            except TypeError:  # pragma: no cover - macOS < 10.9 fallback
+                trusted = AXIsProcessTrusted()
+            return bool(trusted)
+
+        return _pyobjc_check
 
     try:
-        trusted = AXIsProcessTrustedWithOptions({kAXTrustedCheckOptionPrompt: True})
-    except TypeError:  # pragma: no cover - macOS < 10.9 fallback
-        trusted = AXIsProcessTrusted()
-    return bool(trusted)
+        import ctypes
+        from ctypes import util
+
+        path = util.find_library("ApplicationServices")
+        if not path:
+            LOGGER.warning("Unable to locate ApplicationServices framework to verify accessibility permission")
+            return None
+        quartz = ctypes.cdll.LoadLibrary(path)
+        quartz.AXIsProcessTrusted.restype = ctypes.c_bool
+        quartz.AXIsProcessTrusted.argtypes = []
+    except Exception as cexc:  # pragma: no cover
+        LOGGER.warning("Unable to verify accessibility permission: %s", cexc)
+        return None
+    return lambda: bool(quartz.AXIsProcessTrusted())
+
+
+def _check_accessibility_permission() -> bool:
+    """Return True when macOS Accessibility permission is granted."""
+    global _trust_cache
+    now = time.monotonic()
+    cached = _trust_cache
+    if cached is not None and now - cached[0] < _TRUST_CACHE_SECONDS:
+        return cached[1]
+    check = _load_trust_check()
+    if check is None:
+        trusted = True
+    else:
+        try:
+            trusted = check()
+        except Exception as exc:  # pragma: no cover
+            LOGGER.warning("Unable to verify accessibility permission: %s", exc)
+            trusted = True
+    _trust_cache = (now, trusted)
+    return trusted
 
 
 def _ensure_macos_accessibility() -> None:
@@ -84,8 +115,14 @@ class MacKeyListener:
         except Exception:
             CFRunLoopStop = None  # type: ignore
         if CFRunLoopStop and self._run_loop is not None:
-            CFRunLoopStop(self._run_loop)
-        self._thread.join(timeout=1.0)
+            # A stop that lands just before CFRunLoopRun starts is discarded by the
+            # run loop, so keep signalling until the thread has actually exited.
+            deadline = time.monotonic() + 1.0
+            while self._thread.is_alive() and time.monotonic() < deadline:
+                CFRunLoopStop(self._run_loop)
+                self._thread.join(timeout=0.05)
+        else:
+            self._thread.join(timeout=1.0)
         self._thread = None
         self._run_loop = None
         self._tap = None
@@ -98,7 +135,7 @@ class MacKeyListener:
                 CFRunLoopAddSource,
                 CFRunLoopGetCurrent,
                 CFRunLoopRemoveSource,
-                CFRunLoopRunInMode,
+                CFRunLoopRun,
                 CGEventGetIntegerValueField,
                 CGEventMaskBit,
                 CGEventTapCreate,
@@ -115,6 +152,8 @@ class MacKeyListener:
             self._ready_event.set()
             return
 
+        debug = LOGGER.isEnabledFor(logging.DEBUG)
+
         def _callback(proxy, event_type, event, refcon):  # pragma: no cover - executed by CoreGraphics
             if event_type == kCGEventTapDisabledByTimeout and self._tap is not None:
                 CGEventTapEnable(self._tap, True)
@@ -123,7 +162,8 @@ class MacKeyListener:
                 return event
             keycode = CGEventGetIntegerValueField(event, kCGKeyboardEventKeycode)
             name = keycode_to_name(int(keycode))
-            LOGGER.debug("mac keydown keycode=%s name=%s", keycode, name)
+            if debug:
+                LOGGER.debug("mac keydown keycode=%s name=%s", keycode, name)
             try:
                 self._handler(name)
             except Exception:
@@ -155,8 +195,10 @@ class MacKeyListener:
         self._ready_event.set()
 
         try:
-            while not self._stop_event.is_set():
-                CFRunLoopRunInMode(kCFRunLoopDefaultMode, 0.1, True)
+            # Block until stop() calls CFRunLoopStop; the thread stays asleep between
+            # key events instead of waking up to poll.
+            if not self._stop_event.is_set():
+                CFRunLoopRun()
         finally:
             CFRunLoopRemoveSource(run_loop, source, kCFRunLoopDefaultMode)
             CFMachPortInvalidate(tap)
@@ -1,66 +1,235 @@
 from __future__ import annotations
 
-import threading
-from dataclasses import dataclass
+import ctypes
+import sys
+from collections import deque
 
 import numpy as np
 
 from .audio import AudioClip
 
+try:
+    from numba import njit, types
+except ImportError:  # pragma: no cover - optional accelerator
+    njit = None
 
-@dataclass(eq=False)
-class PlaybackInstance:
-    clip: AudioClip
-    volume: float
-    position: int = 0
+if njit is not None:
+    # Compiled eagerly for the one layout the mixer uses (C-contiguous float32
+    # frames x channels) so no JIT compilation can happen inside the audio callback.
+    # Clip buffers are declared read-only: decoded, disk-cached and broadcast clips
+    # are immutable, and writable arrays still dispatch to a read-only parameter.
+    _CLIP_TYPE = types.Array(types.float32, 2, "C", readonly=True)
+
+    @njit(types.void(types.float32[:, ::1], _CLIP_TYPE, types.int64, types.int64, types.float32, types.boolean),
+          cache=True, fastmath=True, boundscheck=False, nogil=True)
+    def _mix_voice(out, samples, start, frames, volume, saturate):  # pragma: no cover - compiled
+        # Walk both buffers as flat interleaved runs indexed from zero: an inner loop
+        # over 1-2 channels, or an offset index, keeps LLVM from vectorising.
+        count = frames * samples.shape[1]
+        offset = start * samples.shape[1]
+        dst = out.reshape(-1)[:count]
+        src = samples.reshape(-1)[offset : offset + count]
+        if saturate:
+            for i in range(count):
+                value = dst[i] + src[i] * volume
+                if value > np.float32(1.0):
+                    value = np.float32(1.0)
+                elif value < np.float32(-1.0):
+                    value = np.float32(-1.0)
+                dst[i] = value
+        else:
+            for i in range(count):
+                dst[i] += src[i] * volume
+else:
+    _mix_voice = None
+
+
+def _load_vdsp_vsma():
+    # vDSP_vsma (D = A * b + C) from Accelerate; used on macOS when Numba is absent.
+    if sys.platform != "darwin":
+        return None
+    try:
+        accelerate = ctypes.CDLL("/System/Library/Frameworks/Accelerate.framework/Accelerate")
+        vsma = accelerate.vDSP_vsma
+    except (OSError, AttributeError):  # pragma: no cover - framework missing
+        return None
+    vsma.argtypes = [
+        ctypes.c_void_p,
+        ctypes.c_long,
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.c_void_p,
+        ctypes.c_long,
+        ctypes.c_void_p,
+        ctypes.c_long,
+        ctypes.c_ulong,
+    ]
+    vsma.restype = None
+    return vsma
+
+
+_vdsp_vsma = _load_vdsp_vsma() if _mix_voice is None else None
+
+
+_MAX_VOICES = 32
+_PENDING_LIMIT = 256
+_UNITY_EPSILON = 1e-6
+# float32 bounds for the final clamp; ufunc minimum/maximum with matching scalars
+# cost well under np.clip's Python-level dispatch on a callback-sized block.
+_SAMPLE_MAX = np.float32(1.0)
+_SAMPLE_MIN = np.float32(-1.0)
 
 
 class Mixer:
-    def __init__(self, sample_rate: int, channels: int) -> None:
+    def __init__(self, sample_rate: int, channels: int, max_voices: int = _MAX_VOICES) -> None:
         self.sample_rate = sample_rate
         self.channels = channels
-        self._lock = threading.Lock()
-        self._instances: list[PlaybackInstance] = []
-
-    def queue_clip(self, clip: AudioClip, volume: float) -> None:
-        instance = PlaybackInstance(clip=clip, volume=volume)
-        with self._lock:
-            self._instances.append(instance)
-        # Debug-level logging happens elsewhere to avoid import cycle
-
-    def mix(self, frames: int) -> np.ndarray:
-        block = np.zeros((frames, self.channels), dtype=np.float32)
-        finished: list[PlaybackInstance] = []
-        with self._lock:
-            for instance in self._instances:
-                clip_frames = instance.clip.frame_count
-                remaining = clip_frames - instance.position
-                if remaining <= 0:
-                    finished.append(instance)
-                    continue
-                take = min(frames, remaining)
-                chunk = instance.clip.samples[instance.position : instance.position + take]
-                if chunk.shape[1] != self.channels:
-                    # Safety guard; should not happen
-                    if chunk.shape[1] == 1 and self.channels == 2:
-                        chunk = np.repeat(chunk, 2, axis=1)
-                    elif chunk.shape[1] > self.channels:
-                        chunk = chunk[:, : self.channels]
-                    else:
-                        chunk = np.pad(chunk, ((0, 0), (0, self.channels - chunk.shape[1])), mode="edge")
-                block[:take] += chunk * instance.volume
-                instance.position += take
-                if instance.position >= clip_frames:
-                    finished.append(instance)
-            if finished:
-                finished_ids = {id(i) for i in finished}
-                self._instances = [i for i in self._instances if id(i) not in finished_ids]
-        np.clip(block, -1.0, 1.0, out=block)
-        return block
+        # Key threads hand new voices to the audio callback through this deque;
+        # append and popleft are atomic, so neither side ever takes a lock.
+        self._pending: deque[tuple[np.ndarray, int, float]] = deque(maxlen=_PENDING_LIMIT)
+        # Fixed pool of ``max_voices`` voice slots as parallel lists (struct of arrays),
+        # owned by the audio callback thread; slots ``[0, _count)`` are live, in no
+        # particular order. They hold plain Python numbers: at this size list indexing
+        # is far cheaper than NumPy calls on tiny arrays. ``_ages`` orders voices for
+        # stealing and ``_addresses`` caches each buffer's data pointer for vDSP.
+        self._max_voices = max_voices
+        self._count = 0
+        self._next_age = 0
+        self._samples: list[np.ndarray | None] = [None] * max_voices
+        self._positions = [0] * max_voices
+        self._frame_counts = [0] * max_voices
+        self._volumes = [0.0] * max_voices
+        self._addresses = [0] * max_voices
+        self._ages = [0] * max_voices
+        # Volume-scaled chunk buffers for the NumPy fallback, keyed by callback size;
+        # the stream asks for the same frame count every time, so they are allocated
+        # once. Only the Numba path is free of per-callback arrays: the vDSP and NumPy
+        # paths still create a few small views of ``out`` and the clip per voice.
+        self._scratch: dict[int, np.ndarray] = {}
+        self._vdsp_volume = ctypes.c_float()
+        self._vdsp_volume_ptr = ctypes.pointer(self._vdsp_volume)
+
+    def queue_clip(self, clip: AudioClip, volume: float = 1.0) -> None:
+        # AudioLibrary converts every clip to the output channel count at load time.
+        assert clip.channels == self.channels, "clip channel count does not match the mixer"
+        samples = clip.samples
+        # The accumulate loop needs C-contiguous float32 rows. AudioLibrary clips
+        # already are (views into its aligned atlas), so this normally costs a flag check.
+        # Read-only buffers (decoded, mmap-cached) are only ever read and pass as-is.
+        if samples.dtype != np.float32 or not samples.flags.c_contiguous:
+            samples = np.ascontiguousarray(samples, dtype=np.float32)
+        self._pending.append((samples, clip.frame_count, volume))
+
+    def mix_into(self, out: np.ndarray) -> None:
+        """Mix the active voices into ``out`` (frames, channels), overwriting it."""
+        out.fill(0.0)
+        pending = self._pending
+        if not self._count and not pending:
+            # Idle between keystrokes, which is most callbacks. A clip queued right
+            # after this check is picked up by the next callback.
+            return
+        while pending:  # single consumer, so a non-empty deque cannot race to empty
+            self._add_voice(*pending.popleft())
+        positions = self._positions
+        frame_counts = self._frame_counts
+        count = self._count
+        # The longest voice goes last: its pass covers every frame any voice
+        # touched, so it can clamp the final sums as it writes them instead of a
+        # separate clip pass.
+        last = 0
+        for index in range(1, count):
+            if frame_counts[index] - positions[index] > frame_counts[last] - positions[last]:
+                last = index
+        frames = out.shape[0]
+        out_address = out.ctypes.data if _vdsp_vsma is not None else 0
+        finished = False
+        for index in range(count):
+            if index != last:
+                finished |= self._accumulate(out, out_address, frames, index, False)
+        finished |= self._accumulate(out, out_address, frames, last, True)
+        if finished:
+            self._drop_finished()
 
     def reset(self) -> None:
-        with self._lock:
-            self._instances.clear()
+        # Only call while the audio stream is stopped; voices belong to its thread.
+        self._pending.clear()
+        self._samples[:] = [None] * self._max_voices
+        self._count = 0
+
+    def _accumulate(self, out: np.ndarray, out_address: int, frames: int, index: int, saturate: bool) -> bool:
+        # Accumulate the next block of voice ``index`` and advance it; returns True
+        # once the voice has played to its end.
+        start = self._positions[index]
+        frame_count = self._frame_counts[index]
+        take = min(frame_count - start, frames)
+        self._positions[index] = start + take
+        volume = self._volumes[index]
+        if _mix_voice is not None:
+            _mix_voice(out, self._samples[index], start, take, volume, saturate)
+            return start + take == frame_count
+        block = out[:take]
+        if _vdsp_vsma is not None:
+            # In-place multiply-add over the interleaved samples, no temporary.
+            self._vdsp_volume.value = volume
+            source = self._addresses[index] + start * self.channels * 4
+            _vdsp_vsma(source, 1, self._vdsp_volume_ptr, out_address, 1, out_address, 1, take * self.channels)
+        else:
+            chunk = self._samples[index][start : start + take]
+            if abs(volume - 1.0) < _UNITY_EPSILON:
+                # Unity gain (every keypress from the runner): add straight in.
+                np.add(block, chunk, out=block)
+            else:
+                scaled = self._get_scratch(frames)[:take]
+                np.multiply(chunk, np.float32(volume), out=scaled)
+                np.add(block, scaled, out=block)
+        if saturate:
+            np.minimum(block, _SAMPLE_MAX, out=block)
+            np.maximum(block, _SAMPLE_MIN, out=block)
+        return start + take == frame_count
+
+    def _get_scratch(self, frames: int) -> np.ndarray:
+        scratch = self._scratch.get(frames)
+        if scratch is None:
+            scratch = self._scratch[frames] = np.empty((frames, self.channels), dtype=np.float32)
+        return scratch
+
+    def _voice_lists(self) -> tuple[list, ...]:
+        return self._samples, self._positions, self._frame_counts, self._volumes, self._addresses, self._ages
+
+    def _add_voice(self, samples: np.ndarray, frame_count: int, volume: float) -> None:
+        # Only voices queued since the last callback are still at position 0. If one
+        # of them plays the same buffer, the two would stay sample-aligned for their
+        # whole life, so fold the volume into it and mix the buffer once.
+        count = self._count
+        for index in range(count):
+            if self._positions[index] == 0 and self._samples[index] is samples:
+                self._volumes[index] += volume
+                return
+        if count < self._max_voices:
+            index = count
+            self._count = count + 1
+        else:
+            # Voice limit reached: reuse the slot of the oldest voice.
+            index = min(range(count), key=self._ages.__getitem__)
+        self._samples[index] = samples
+        self._positions[index] = 0
+        self._frame_counts[index] = frame_count
+        self._volumes[index] = volume
+        self._addresses[index] = samples.ctypes.data if _vdsp_vsma is not None else 0
+        self._ages[index] = self._next_age
+        self._next_age += 1
+
+    def _drop_finished(self) -> None:
+        # Move the last live voice into each finished slot; walking downwards means
+        # every voice moved has already been checked.
+        for index in range(self._count - 1, -1, -1):
+            if self._positions[index] < self._frame_counts[index]:
+                continue
+            last = self._count - 1
+            if index != last:
+                for voices in self._voice_lists():
+                    voices[index] = voices[last]
+            self._samples[last] = None
+            self._count = last
 
 
-__all__ = ["Mixer", "PlaybackInstance"]
+__all__ = ["Mixer"]
@@ -4,8 +4,6 @@ import logging
 import threading
 from typing import Optional
 
-import numpy as np
-
 try:
     import sounddevice as sd
 except ImportError as exc:  # pragma: no cover - dependency resolution validation
@@ -24,11 +22,17 @@ class AudioPlayer:
         self._block_size = block_size
         self._stream: Optional[sd.OutputStream] = None
         self._lock = threading.Lock()
+        # The audio callback only records underflow/overflow status; it is logged
+        # from stop() so the realtime thread never enters the logging machinery.
+        self._status_count = 0
+        self._last_status = None
 
     def start(self) -> None:
         with self._lock:
             if self._stream is not None:
                 return
+            self._status_count = 0
+            self._last_status = None
             self._stream = sd.OutputStream(
                 samplerate=self._mixer.sample_rate,
                 blocksize=self._block_size,
@@ -48,17 +52,16 @@ class AudioPlayer:
             stream.stop()
         finally:
             stream.close()
+        if self._status_count:
+            LOGGER.warning(
+                "Audio callback reported %d status event(s); last: %s", self._status_count, self._last_status
+            )
 
     def _callback(self, outdata, frames, time, status) -> None:  # pragma: no cover - realtime
         if status:
-            LOGGER.warning("Audio callback status: %s", status)
-        block = self._mixer.mix(frames)
-        if block.shape[0] < frames:
-            padded = np.zeros((frames, self._mixer.channels), dtype="float32")
-            padded[: block.shape[0]] = block
-            outdata[:] = padded
-        else:
-            outdata[:] = block
+            self._last_status = status
+            self._status_count += 1
+        self._mixer.mix_into(outdata)
 
 
 __all__ = ["AudioPlayer"]
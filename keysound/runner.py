@@ -16,7 +16,7 @@ class KeysoundRunner:
     def __init__(self, config: KeysoundConfig) -> None:
         config.validate()
         self.config = config
-        self.library = AudioLibrary(config.mode, config.source)
+        self.library = AudioLibrary(config.mode, config.source, config.volume)
         if self.library.sample_rate is None or self.library.channels is None:
             raise RuntimeError("Audio library failed to initialise output format")
         self.mixer = Mixer(self.library.sample_rate, self.library.channels)
@@ -24,6 +24,8 @@ class KeysoundRunner:
         self.listener = GlobalKeyListener(self._handle_key)
         self._running = False
         self._lock = threading.Lock()
+        # Sampled in start() so key events skip the logger level check.
+        self._debug = False
 
     def start(self) -> None:
         with self._lock:
@@ -34,6 +36,7 @@ class KeysoundRunner:
             self.player.start()
             LOGGER.debug("Audio output initialised")
             LOGGER.debug("Starting key listener")
+            self._debug = LOGGER.isEnabledFor(logging.DEBUG)
             self.listener.start()
             LOGGER.debug("Key listener running")
             self._running = True
@@ -56,15 +59,19 @@ class KeysoundRunner:
             return self._running
 
     def _handle_key(self, key_name: str) -> bool:
-        LOGGER.debug("Key event: %s", key_name)
+        debug = self._debug
+        if debug:
+            LOGGER.debug("Key event: %s", key_name)
         clip = self.library.clip_for_name(key_name)
         if clip is None and key_name == "default":
             clip = self.library.default_clip
         if clip is None:
-            LOGGER.debug("No clip mapped for %s", key_name)
+            if debug:
+                LOGGER.debug("No clip mapped for %s", key_name)
             return False
-        self.mixer.queue_clip(clip, self.config.volume)
-        LOGGER.debug("Queued clip for %s", key_name)
+        self.mixer.queue_clip(clip)
+        if debug:
+            LOGGER.debug("Queued clip for %s", key_name)
         return True
 
     def __enter__(self) -> "KeysoundRunner":